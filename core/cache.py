@@ -0,0 +1,192 @@
+# core/cache.py
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+import uuid
+from typing import List, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _canonical_json(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True).encode()
+
+
+class SQLiteCache:
+    """
+    Persistent cache for LLM slide responses, backed by SQLite.
+    Entries survive worker restarts and are shared between workers on the same host.
+    """
+
+    def __init__(self, path: str = "cache.db", ttl: float = 1800, timeout: float = 5.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # timeout: how long to wait on another worker's write lock before giving up
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        # WAL lets several workers read while one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, ts REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_ts ON cache (ts)")
+        self._conn.commit()
+
+    # Cache failures (e.g. "database is locked") are logged and treated as a miss or
+    # a skipped write, so they never replace or fail an otherwise good response.
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        cutoff = time.time() - self.ttl
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM cache WHERE key = ? AND ts > ?", (key, cutoff)
+                ).fetchone()
+            if row is None:
+                return None
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Persistent cache read failed: {str(e)}")
+            return None
+
+    def set(self, key: str, slides: List[Dict]) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)",
+                        (key, json.dumps(slides), now),
+                    )
+                    # Sweep expired rows so the database doesn't grow forever
+                    self._conn.execute("DELETE FROM cache WHERE ts <= ?", (now - self.ttl,))
+                    self._conn.commit()
+                except sqlite3.Error:
+                    self._conn.rollback()
+                    raise
+        except sqlite3.Error as e:
+            print(f"Persistent cache write failed: {str(e)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+
+def open_cache(ttl: float = 1800) -> Optional[SQLiteCache]:
+    """Open the shared response cache, or return None if the database is unavailable."""
+    path = os.getenv("LLM_CACHE_DB", "cache.db")
+    try:
+        return SQLiteCache(path, ttl=ttl)
+    except sqlite3.Error as e:
+        print(f"Persistent cache disabled: {str(e)}")
+        return None
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink src to dst, copying instead when they are on different filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+class PptxFileCache:
+    """
+    On-disk cache of generated decks, keyed by a hash of the slide data and template.
+    Least recently used files are evicted once more than max_files (at least 1) are stored.
+    Decks are linked or copied in and out, so eviction never removes a file being served.
+    """
+
+    def __init__(self, directory: str, max_files: int = 64):
+        self.directory = directory
+        self.max_files = max(1, max_files)
+        self._lock = threading.Lock()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Decks are served straight from here, so refuse a directory someone else
+        # could have created or can write to (they could plant files under hash names)
+        st = os.lstat(directory)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+            raise PermissionError(f"{directory} must be a directory owned by this user and not group/world-writable")
+
+    @staticmethod
+    def make_key(slide_data: List[Dict], template_digest: str = "") -> str:
+        return hashlib.sha256(_canonical_json([slide_data, template_digest])).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pptx")
+
+    def get(self, key: str, dest_path: str) -> bool:
+        """Link or copy the cached deck to dest_path; False if it isn't cached."""
+        path = self._path(key)
+        try:
+            # Bump the mtime so eviction treats this deck as recently used
+            os.utime(path)
+            _link_or_copy(path, dest_path)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            print(f"Deck cache read failed: {str(e)}")
+            return False
+        return True
+
+    def put(self, key: str, file_path: str) -> None:
+        """Store a generated deck in the cache; file_path itself is left in place."""
+        path = self._path(key)
+        # Link into a temp name first so readers never see a partially copied file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            _link_or_copy(file_path, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        self._evict(keep=path)
+
+    def _evict(self, keep: str) -> None:
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                # Never evict the deck that was just stored
+                if entry.name.endswith(".pptx") and entry.path != keep:
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:
+                        continue
+            entries.sort()
+            # keep itself takes one of the max_files slots
+            for _, path in entries[:max(0, len(entries) + 1 - self.max_files)]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+def open_deck_cache() -> Optional[PptxFileCache]:
+    """Open the generated-deck cache, or return None if its directory is unusable."""
+    default_dir = os.path.join(tempfile.gettempdir(), f"ppt-gen-cache-{os.getuid()}")
+    directory = os.getenv("PPTX_CACHE_DIR", default_dir)
+    try:
+        max_files = int(os.getenv("PPTX_CACHE_MAX_FILES", "64"))
+    except ValueError:
+        print("Invalid PPTX_CACHE_MAX_FILES, using 64")
+        max_files = 64
+    try:
+        return PptxFileCache(directory, max_files=max_files)
+    except OSError as e:
+        print(f"Deck cache disabled: {str(e)}")
+        return None
@@ -1,62 +1,187 @@
 # core/generator.py
 
+import functools
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+
+import pptx
+from lxml import etree
 from pptx import Presentation
 from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml import parse_xml
+from pptx.parts.slide import SlidePart
+
+# Body OR a generic Object placeholder, which is common
+_BODY_TYPES = frozenset({PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT})
+
+# Chosen "Title and Content" layout index per template, keyed by content hash
+# (uploaded templates land in a fresh temp path on every request).
+_LAYOUT_CACHE_SIZE = 8
+_LAYOUT_INDEX_CACHE = OrderedDict()
+_layout_cache_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _default_template_bytes():
+    """Bytes of python-pptx's bundled default template, read from disk once."""
+    path = os.path.join(os.path.dirname(pptx.__file__), "templates", "default.pptx")
+    with open(path, "rb") as f:
+        return f.read()
+
+def _load_template_bytes(template_path):
+    if not template_path:
+        return _default_template_bytes()
+    with open(template_path, "rb") as f:
+        return f.read()
+
+def _find_layout_index(prs):
+    """Index of the first layout with both a title and a body/object placeholder."""
+    for index, layout in enumerate(prs.slide_layouts):
+        # Single pass, reading each placeholder's type once
+        has_title = has_body = False
+        for ph in layout.placeholders:
+            ph_type = ph.placeholder_format.type
+            if ph_type == PP_PLACEHOLDER.TITLE:
+                has_title = True
+            elif ph_type in _BODY_TYPES:
+                has_body = True
+            if has_title and has_body:
+                return index
+    return 1
+
+def _template_layout_index(prs, template_key):
+    """_find_layout_index, memoized by the template's content hash (template_key)."""
+    with _layout_cache_lock:
+        layout_index = _LAYOUT_INDEX_CACHE.get(template_key)
+        if layout_index is not None:
+            _LAYOUT_INDEX_CACHE.move_to_end(template_key)
+            return layout_index
+
+    layout_index = _find_layout_index(prs)
+    with _layout_cache_lock:
+        _LAYOUT_INDEX_CACHE[template_key] = layout_index
+        if len(_LAYOUT_INDEX_CACHE) > _LAYOUT_CACHE_SIZE:
+            _LAYOUT_INDEX_CACHE.popitem(last=False)
+    return layout_index
 
-def create_ppt_from_template(slide_data, output_path, template_path=None, template_style=None):
+def _resolve_indices(layout):
+    """
+    Placeholder idx values of the title and body on slides created from layout.
+    Slides copy the layout's cloneable placeholders (same idx, same order), so this
+    is resolved once per deck instead of scanning every slide.
+    """
+    title_idx = body_idx = None
+    for ph in layout.iter_cloneable_placeholders():
+        idx = ph.placeholder_format.idx
+        # The title placeholder always has idx 0
+        if idx == 0:
+            title_idx = idx
+        # The body is the first other placeholder that is not a title
+        elif body_idx is None and ph.placeholder_format.type != PP_PLACEHOLDER.TITLE:
+            body_idx = idx
+    return title_idx, body_idx
+
+# Same handling as python-pptx's run text setter: \n and \v become line breaks and
+# other control characters (invalid in XML) are written as _xHHHH_ escapes.
+_LINE_BREAK_RE = re.compile(r'\n|\v')
+_CTRL_CHARS_RE = re.compile(r'[\x00-\x08\x0B-\x1F]')
+
+def _escape_run_text(text):
+    return escape(_CTRL_CHARS_RE.sub(lambda m: "_x%04X_" % ord(m.group(0)), text))
+
+def _runs_xml(text):
+    runs = []
+    for i, line in enumerate(_LINE_BREAK_RE.split(text)):
+        if i > 0:
+            runs.append("<a:br/>")
+        if line:
+            runs.append(f"<a:r><a:t>{_escape_run_text(line)}</a:t></a:r>")
+    return "".join(runs)
+
+def _title_paragraphs_xml(title):
+    """Paragraphs for a title, split on \n like python-pptx's TextFrame.text setter."""
+    return "".join(f"<a:p>{_runs_xml(line)}</a:p>" for line in str(title).split("\n"))
+
+def _bullet_paragraphs_xml(points):
+    """One level-0 paragraph per point (a single empty paragraph when there are none)."""
+    if not points:
+        return "<a:p/>"
+    return "".join(f'<a:p><a:pPr lvl="0"/>{_runs_xml(str(point))}</a:p>' for point in points)
+
+_SLOT_RE = re.compile(r'<!--ppt-gen:(title|body)-->')
+
+def _slide_xml_template(layout, title_idx, body_idx):
+    """
+    Serialized XML of a blank slide based on layout, as a list alternating literal
+    XML with slot names ("title"/"body") where that placeholder's paragraphs go.
+    """
+    # Built like Slides.add_slide, but never related to the presentation so it isn't saved
+    prototype = SlidePart.new(PackURI("/ppt/slides/prototype.xml"), layout.part.package, layout.part)
+    prototype.slide.shapes.clone_layout_placeholders(layout)
+
+    placeholders = prototype.slide.placeholders
+    for idx, slot in ((title_idx, "title"), (body_idx, "body")):
+        if idx is None:
+            continue
+        txBody = placeholders[idx].text_frame._txBody
+        for p in txBody.p_lst:
+            txBody.remove(p)
+        txBody.append(etree.Comment(f"ppt-gen:{slot}"))
+
+    return _SLOT_RE.split(etree.tostring(prototype._element, encoding="unicode"))
+
+def _add_slides(prs, layout, slide_data):
+    """
+    Add one slide per item by formatting the layout's slide XML and attaching the
+    parsed part directly, instead of add_slide plus per-shape/per-paragraph edits.
+    """
+    title_idx, body_idx = _resolve_indices(layout)
+    segments = _slide_xml_template(layout, title_idx, body_idx)
+
+    prs.slides  # normalizes existing slide partnames to slide1..N
+    sldIdLst = prs.element.get_or_add_sldIdLst()
+    package = prs.part.package
+
+    for item in slide_data:
+        slots = {
+            "title": _title_paragraphs_xml(item.get("title", "No Title")),
+            "body": _bullet_paragraphs_xml(item.get("points", [])),
+        }
+        # Odd positions of segments are slot names, even positions literal XML
+        xml = "".join(slots[seg] if i % 2 else seg for i, seg in enumerate(segments))
+
+        partname = PackURI(f"/ppt/slides/slide{len(sldIdLst) + 1}.xml")
+        slide_part = SlidePart(partname, CT.PML_SLIDE, package, parse_xml(xml))
+        slide_part.relate_to(layout.part, RT.SLIDE_LAYOUT)
+        sldIdLst.add_sldId(prs.part.relate_to(slide_part, RT.SLIDE))
+
+def create_ppt_from_template(slide_data, output_path, template_path=None, template_style=None, template_digest=None):
     """
     Creates a PPT file from slide_data, applying styles from a template.
     This version is more robust for handling non-standard templates.
+    template_digest is the template's SHA-256 hex digest, if the caller already has it.
     """
-    prs = Presentation(template_path) if template_path else Presentation()
+    template_bytes = _load_template_bytes(template_path)
+    prs = Presentation(io.BytesIO(template_bytes))
 
     # --- Find a suitable "Title and Content" layout ---
-    title_and_content_layout = None
-    for layout in prs.slide_layouts:
-        has_title = any(ph.placeholder_format.type == PP_PLACEHOLDER.TITLE for ph in layout.placeholders)
-        # Check for Body OR a generic Object placeholder, which is common
-        has_body = any(ph.placeholder_format.type in (PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT) for ph in layout.placeholders)
-        if has_title and has_body:
-            title_and_content_layout = layout
-            break
-
-    if not title_and_content_layout:
-        title_and_content_layout = prs.slide_layouts[1]
+    if template_path:
+        template_key = template_digest or hashlib.sha256(template_bytes).hexdigest()
+        layout_index = _template_layout_index(prs, template_key)
+    else:
+        # The default template's second layout is already "Title and Content"
+        layout_index = 1
+
+    title_and_content_layout = prs.slide_layouts[layout_index]
 
     # --- Create slides ---
-    for item in slide_data:
-        slide = prs.slides.add_slide(title_and_content_layout)
-        
-        title_shape = slide.shapes.title
-        body_shape = None
-
-        # --- NEW, MORE ROBUST LOGIC TO FIND THE BODY SHAPE ---
-        # Find the title placeholder
-        if title_shape:
-            title_shape.text = item.get("title", "No Title")
-
-        # Iterate through all placeholders on the slide to find the body
-        for shape in slide.placeholders:
-            # The title placeholder is handled, so we look for the next available one
-            if shape.placeholder_format.type != PP_PLACEHOLDER.TITLE:
-                body_shape = shape
-                break
-        
-        # --- End of new logic ---
-        
-        if body_shape:
-            tf = body_shape.text_frame
-            tf.clear()
-            
-            points = item.get("points", [])
-            if points:
-                p = tf.paragraphs[0]
-                p.text = points[0]
-                
-                for point_text in points[1:]:
-                    p = tf.add_paragraph()
-                    p.text = point_text
-                    p.level = 0
+    _add_slides(prs, title_and_content_layout, slide_data)
 
     prs.save(output_path)
     return output_path
\ No newline at end of file
@@ -1,24 +1,73 @@
+import asyncio
+import hashlib
 import json
+import os
 import re
-from typing import List, Dict
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from functools import lru_cache, wraps
+from itertools import islice
+from typing import List, Dict, Optional, Tuple
 
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
-def generate_slide_content(text_content: str, guidance: str = "", llm_provider: str = "openai", api_key: str = "") -> List[Dict]:
-    """
-    Calls an LLM API to generate structured slide content from input text.
-    Returns a list of dictionaries with slide data.
-    """
-    if not api_key:
-        raise ValueError("API key is required")
-    
-    # Create the prompt
-    base_prompt = f"""
-Convert the following text into a structured PowerPoint presentation. 
+from core.cache import open_cache
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_BULLET_RE = re.compile(r'^[-*•]\s*')
+_NUM_RE = re.compile(r'^\d+[.):]\s*')
+_PARA_RE = re.compile(r'\n\s*\n')
+# A run of non-terminator text plus its terminator (or end of text); group 1 is the body
+_SENT_RE = re.compile(r'([^.!?]+)(?:[.!?]+|$)')
+
+
+class LLMCache:
+    """Simple in-process TTL cache for LLM slide responses, capped at max_entries (LRU)."""
+
+    def __init__(self, ttl: float = 1800, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._store: "OrderedDict[str, Tuple[List[Dict], float]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(llm_provider: str, prompt: str) -> str:
+        payload = json.dumps({"provider": llm_provider, "prompt": prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        slides, expires_at = entry
+        if time.monotonic() >= expires_at:
+            # Expire lazily on lookup
+            self._store.pop(key, None)
+            return None
+        self._store.move_to_end(key)
+        return slides
 
-Text to convert:
-{text_content}
+    def set(self, key: str, slides: List[Dict]) -> None:
+        self._store[key] = (slides, time.monotonic() + self.ttl)
+        self._store.move_to_end(key)
+        # Keys that are never looked up again would otherwise stay forever
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
 
-Additional guidance: {guidance if guidance else "Standard presentation format"}
+    def clear(self) -> None:
+        self._store.clear()
+
+
+# Static instructions kept byte-identical across requests so providers can reuse
+# their prompt (prefix) cache. Never interpolate request data into this string.
+SYSTEM_PROMPT = """You are a presentation expert who converts text into structured slide content.
+
+Convert the text provided by the user into a structured PowerPoint presentation.
 
 Requirements:
 1. Analyze the content and determine the optimal number of slides (typically 5-12 slides)
@@ -28,112 +77,443 @@ Requirements:
 5. Include 2-6 bullet points per slide maximum
 6. Make content concise and presentation-friendly
 
-Return the response as a JSON array with this exact format:
-[
-  {{
-    "title": "Introduction",
-    "points": ["Key point 1", "Key point 2", "Key point 3"]
-  }},
-  {{
-    "title": "Main Topic",
-    "points": ["Supporting detail 1", "Supporting detail 2"]
-  }}
-]
-
-Important: Return ONLY the JSON array, no additional text or formatting.
+Return the response as a JSON object with this exact format:
+{
+  "slides": [
+    {
+      "title": "Introduction",
+      "points": ["Key point 1", "Key point 2", "Key point 3"]
+    },
+    {
+      "title": "Main Topic",
+      "points": ["Supporting detail 1", "Supporting detail 2"]
+    }
+  ]
+}
+
+Important: Return ONLY the JSON object, no additional text or formatting.
 """
 
+# Keep sampling parameters fixed: they are part of what makes a response (and a
+# provider-side cache entry) reusable for the same prompt.
+TEMPERATURE = 0.7
+
+# Slide JSON is typically well under 800 tokens; a tighter output budget keeps decode
+# latency down. A response cut off at the limit is retried once with
+# TRUNCATION_RETRY_FACTOR times the budget before falling back to text analysis.
+MAX_OUTPUT_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "1024"))
+TRUNCATION_RETRY_FACTOR = 2
+OPENAI_MODEL = "gpt-4o-mini"
+
+# Inputs longer than CHUNK_CHARS are split into at most MAX_CHUNKS sections that are
+# converted concurrently.
+CHUNK_CHARS = 6000
+MAX_CHUNKS = 8
+
+# Cap on in-flight provider requests per API key (provider RPM/TPM limits are per key)
+MAX_CONCURRENT_CALLS = int(os.getenv("LLM_MAX_CONCURRENT_CALLS", "4"))
+
+class ResponseTruncatedError(Exception):
+    """The provider stopped at the output token limit before the slide JSON was complete."""
+
+
+cache = LLMCache()
+persistent_cache = open_cache(ttl=cache.ttl)
+
+
+async def generate_slide_content(text_content: str, guidance: str = "", llm_provider: str = "openai", api_key: str = "") -> List[Dict]:
+    """
+    Calls an LLM API to generate structured slide content from input text.
+    Long inputs are split into sections which are converted concurrently.
+    Returns a list of dictionaries with slide data.
+    """
+    if not api_key:
+        raise ValueError("API key is required")
+    
+    guidance_text = guidance if guidance else "Standard presentation format"
+    # Only the variable part goes in the user message; SYSTEM_PROMPT stays a stable prefix
+    user_prompt = f"Text to convert:\n{text_content}\n\nAdditional guidance: {guidance_text}"
+
+    cache_key = LLMCache.make_key(llm_provider.lower(), SYSTEM_PROMPT + user_prompt)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    if persistent_cache is not None:
+        # SQLite may wait on another worker's write lock, keep that off the event loop
+        cached = await asyncio.to_thread(persistent_cache.get, cache_key)
+        if cached is not None:
+            cache.set(cache_key, cached)
+            return cached
+
     try:
-        if llm_provider.lower() == "openai":
-            return _call_openai(base_prompt, api_key)
-        elif llm_provider.lower() == "anthropic":
-            return _call_anthropic(base_prompt, api_key)
-        elif llm_provider.lower() == "gemini":
-            return _call_gemini(base_prompt, api_key)
-        else:
+        call = _PROVIDERS.get(llm_provider.lower())
+        if call is None:
             raise ValueError(f"Unsupported LLM provider: {llm_provider}")
+
+        chunks = _split_into_chunks(text_content)
+        if len(chunks) == 1:
+            prompts = [user_prompt]
+        else:
+            prompts = [
+                f"Text to convert (section {i + 1} of {len(chunks)} of a longer document; "
+                f"create 1-3 slides covering only this section):\n{chunk}\n\n"
+                f"Additional guidance: {guidance_text}"
+                for i, chunk in enumerate(chunks)
+            ]
+
+        async def _call_section(prompt: str) -> List[Dict]:
+            try:
+                return await call(prompt, api_key, MAX_OUTPUT_TOKENS)
+            except ResponseTruncatedError as e:
+                print(f"{str(e)}, retrying with a larger output budget")
+                return await call(prompt, api_key, MAX_OUTPUT_TOKENS * TRUNCATION_RETRY_FACTOR)
+
+        # Map: one request per section, reduce: concatenate in document order
+        results = await asyncio.gather(*[_call_section(prompt) for prompt in prompts], return_exceptions=True)
+        failed = [r for r in results if isinstance(r, BaseException)]
+        if failed and len(failed) == len(results):
+            raise failed[0]
+
+        slides = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                # Keep the other sections' slides, only this one falls back
+                print(f"Error converting section, using fallback text analysis: {str(result)}")
+                slides.extend(_fallback_content_slides(chunk, max_slides=3))
+            else:
+                slides.extend(result)
     
     except Exception as e:
         print(f"Error calling LLM API: {str(e)}")
         # Fallback: create slides from text analysis
         return _fallback_text_analysis(text_content, guidance)
 
-def _call_openai(prompt: str, api_key: str) -> List[Dict]:
+    # Don't pin a partly-fallback deck in the cache, a retry may fully succeed
+    if not failed:
+        cache.set(cache_key, slides)
+        if persistent_cache is not None:
+            await asyncio.to_thread(persistent_cache.set, cache_key, slides)
+    return slides
+
+def _split_into_chunks(text_content: str, max_chunks: int = MAX_CHUNKS, chunk_chars: int = CHUNK_CHARS) -> List[str]:
+    """Group paragraphs into at most max_chunks sections of roughly chunk_chars characters"""
+    if len(text_content) <= chunk_chars:
+        return [text_content]
+
+    paragraphs = _split_paragraphs(text_content)
+    if not paragraphs:
+        # Nothing sentence-like to group (e.g. only punctuation), send it as one section
+        return [text_content]
+    target = max(chunk_chars, len(text_content) // max_chunks + 1)
+
+    chunks = []
+    current = []
+    current_len = 0
+    for para in paragraphs:
+        if current and current_len + len(para) > target and len(chunks) < max_chunks - 1:
+            chunks.append("\n\n".join(current))
+            current = []
+            current_len = 0
+        current.append(para)
+        current_len += len(para)
+    if current:
+        chunks.append("\n\n".join(current))
+
+    return chunks
+
+def _is_transient_error(exc: BaseException) -> bool:
+    """Rate limits, 5xx responses, timeouts and dropped connections are worth retrying"""
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    # openai/anthropic expose status_code, google.api_core exceptions expose code
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError")
+
+def _log_retry(retry_state) -> None:
+    print(f"Retrying LLM call after error (attempt {retry_state.attempt_number}): {retry_state.outcome.exception()}")
+
+_retry_transient = retry(
+    stop=stop_after_attempt(4),
+    wait=wait_random_exponential(min=1, max=20),
+    retry=retry_if_exception(_is_transient_error),
+    before_sleep=_log_retry,
+    reraise=True,
+)
+
+# api_key -> [semaphore, holders + waiters]. An entry is dropped only once nobody holds
+# or waits on it, so a key in use always keeps the same semaphore and never exceeds its cap.
+_key_slots: Dict[str, list] = {}
+
+def _limit_per_key(func):
+    """
+    Hold one of the API key's MAX_CONCURRENT_CALLS slots for a single attempt. Applied
+    inside _retry_transient so backoff sleeps don't keep a slot, and one user's
+    fan-out or 429s never block requests made with other keys.
+    """
+    @wraps(func)
+    async def wrapper(prompt: str, api_key: str, *args, **kwargs):
+        entry = _key_slots.get(api_key)
+        if entry is None:
+            entry = _key_slots[api_key] = [asyncio.Semaphore(MAX_CONCURRENT_CALLS), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                return await func(prompt, api_key, *args, **kwargs)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _key_slots[api_key]
+    return wrapper
+
+# Clients are reused per API key so their HTTP connection pools (and TLS sessions)
+# survive across requests. Retries are handled by _retry_transient, not the SDKs.
+@lru_cache(maxsize=16)
+def _openai_client(api_key: str):
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=api_key, max_retries=0)
+
+@lru_cache(maxsize=16)
+def _anthropic_client(api_key: str):
+    import anthropic
+    return anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+
+@lru_cache(maxsize=1)
+def _gemini_model(api_key: str):
+    # genai.configure() holds the key globally, so only reconfigure when the key changes
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel("gemini-1.5-flash-latest", system_instruction=SYSTEM_PROMPT)
+
+@_retry_transient
+@_limit_per_key
+async def _call_openai(prompt: str, api_key: str, max_tokens: int = MAX_OUTPUT_TOKENS) -> List[Dict]:
     """Call OpenAI API"""
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        client = _openai_client(api_key)
         
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        stream = await client.chat.completions.create(
+            model=OPENAI_MODEL,
             messages=[
-                {"role": "system", "content": "You are a presentation expert who converts text into structured slide content."},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=2000
+            temperature=TEMPERATURE,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            seed=0,
+            stream=True
         )
         
-        content = response.choices[0].message.content.strip()
-        return _parse_llm_response(content)
+        try:
+            return await _collect_streamed_slides(_openai_text(stream))
+        finally:
+            # Stop generation as soon as the slides have been decoded
+            await stream.close()
     
     except Exception as e:
         print(f"OpenAI API error: {str(e)}")
         raise
 
-def _call_anthropic(prompt: str, api_key: str) -> List[Dict]:
+@_retry_transient
+@_limit_per_key
+async def _call_anthropic(prompt: str, api_key: str, max_tokens: int = MAX_OUTPUT_TOKENS) -> List[Dict]:
     """Call Anthropic API"""
     try:
-        import anthropic
-        client = anthropic.Anthropic(api_key=api_key)
+        client = _anthropic_client(api_key)
         
-        response = client.messages.create(
+        # Leaving the stream context closes the connection once the slides are decoded
+        async with client.messages.stream(
             model="claude-3-sonnet-20240229",
-            max_tokens=2000,
+            max_tokens=max_tokens,
+            # Currently a no-op: claude-3-sonnet-20240229 doesn't support prompt caching and
+            # SYSTEM_PROMPT is below the 1024-token minimum cacheable prefix. It takes effect
+            # once both the model and the prompt size qualify.
+            system=[
+                {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+            ],
             messages=[
                 {"role": "user", "content": prompt}
             ]
-        )
-        
-        content = response.content[0].text.strip()
-        return _parse_llm_response(content)
+        ) as stream:
+            return await _collect_streamed_slides(_anthropic_text(stream))
     
     except Exception as e:
         print(f"Anthropic API error: {str(e)}")
         raise
 
-def _call_gemini(prompt: str, api_key: str) -> List[Dict]:
+@_retry_transient
+@_limit_per_key
+async def _call_gemini(prompt: str, api_key: str, max_tokens: int = MAX_OUTPUT_TOKENS) -> List[Dict]:
     """Call Google Gemini API"""
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash-latest") 
+        model = _gemini_model(api_key)
         
-        response = model.generate_content(prompt)
-        content = response.text.strip()
-        return _parse_llm_response(content)
+        response = await model.generate_content_async(
+            prompt,
+            generation_config={"response_mime_type": "application/json", "max_output_tokens": max_tokens},
+            stream=True
+        )
+        # Closing the text generator cancels the stream once the slides are decoded
+        async with aclosing(_gemini_text(response)) as text_stream:
+            return await _collect_streamed_slides(text_stream)
     
     except Exception as e:
         print(f"Gemini API error: {str(e)}")
         raise
 
+# Text of each provider's stream, raising ResponseTruncatedError if it stopped at the
+# token limit so a cut-off response is never parsed as if it were complete.
+
+async def _openai_text(stream):
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        if choice.finish_reason == "length":
+            raise ResponseTruncatedError("OpenAI response hit max_tokens")
+        yield choice.delta.content or ""
+
+async def _anthropic_text(stream):
+    async for text in stream.text_stream:
+        yield text
+    message = await stream.get_final_message()
+    if message.stop_reason == "max_tokens":
+        raise ResponseTruncatedError("Anthropic response hit max_tokens")
+
+async def _gemini_text(response):
+    chunks = aiter(response)
+    try:
+        async for chunk in chunks:
+            if chunk.candidates and getattr(chunk.candidates[0].finish_reason, "name", None) == "MAX_TOKENS":
+                raise ResponseTruncatedError("Gemini response hit max_output_tokens")
+            yield chunk.text
+    finally:
+        # The SDK has no close(); stop its chunk generator and cancel the underlying call
+        if hasattr(chunks, "aclose"):
+            await chunks.aclose()
+        cancel = getattr(getattr(response, "_iterator", None), "cancel", None)
+        if callable(cancel):
+            cancel()
+
+_PROVIDERS = {
+    "openai": _call_openai,
+    "anthropic": _call_anthropic,
+    "gemini": _call_gemini,
+}
+
+class _JsonStreamScanner:
+    """
+    Tracks bracket depth over streamed text, outside of string literals, and yields
+    each top-level JSON array/object as soon as its closing bracket arrives.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._parts: List[str] = []
+
+    @property
+    def incomplete(self) -> bool:
+        """True while inside a JSON value whose closing bracket hasn't arrived yet."""
+        return self._depth > 0
+
+    def feed(self, text: str):
+        start = 0 if self._depth else None
+        for i, ch in enumerate(text):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch in '[{':
+                if self._depth == 0:
+                    start = i
+                self._depth += 1
+            elif self._depth == 0:
+                # Prose around the JSON value; quotes here are not string literals
+                continue
+            elif ch == '"':
+                self._in_string = True
+            elif ch in ']}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(text[start:i + 1])
+                    candidate = "".join(self._parts)
+                    self._parts.clear()
+                    start = None
+                    yield candidate
+        if self._depth:
+            self._parts.append(text[start:])
+
+def _try_parse_slides(json_str: str) -> Optional[List[Dict]]:
+    """
+    Decode a slides array or {"slides": [...]} object; None if it is not one, so the
+    caller can move on to the next candidate (e.g. past a "[1]" citation in prose).
+    """
+    try:
+        data = _json_loads(json_str.encode())
+    except ValueError:
+        return None
+    if isinstance(data, dict):
+        data = data.get("slides")
+    if isinstance(data, list) and data and all(isinstance(slide, dict) for slide in data):
+        return data
+    return None
+
+async def _collect_streamed_slides(text_stream) -> List[Dict]:
+    """Consume streamed text until it holds a complete slide JSON value, then stop reading"""
+    scanner = _JsonStreamScanner()
+    parts = []
+    async for text in text_stream:
+        parts.append(text)
+        for candidate in scanner.feed(text):
+            slides = _try_parse_slides(candidate)
+            if slides is not None:
+                return slides
+
+    # No candidate decoded to slides (e.g. an unbalanced bracket in prose swallowed the
+    # JSON). Truncation is only reported by the provider's stop reason, so use the
+    # regular (and manual fallback) parsing on the full text.
+    return _parse_llm_response("".join(parts).strip())
+
+def _extract_slides_array(content: str) -> Optional[List[Dict]]:
+    """
+    First balanced JSON value from the first '[' onward that decodes to slides, found in
+    one linear pass that ignores brackets inside string literals. Values that aren't
+    slides (e.g. a "[1]" citation) are skipped. If a stray '[' in prose leaves the pass
+    unbalanced, scanning restarts from the next '['. None if nothing matches.
+    """
+    start = content.find('[')
+    while start >= 0:
+        scanner = _JsonStreamScanner()
+        for candidate in scanner.feed(content[start:]):
+            slides = _try_parse_slides(candidate)
+            if slides is not None:
+                return slides
+        if not scanner.incomplete:
+            break
+        start = content.find('[', start + 1)
+    return None
+
 def _parse_llm_response(content: str) -> List[Dict]:
     """Parse LLM response and extract JSON"""
-    try:
+    # JSON-mode responses are a {"slides": [...]} object; also accept a bare array
+    slides = _try_parse_slides(content)
+    if slides is None:
         # Try to find JSON in the response
-        json_match = re.search(r'\[.*\]', content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
-            return json.loads(json_str)
-        else:
-            # Try parsing the entire content as JSON
-            return json.loads(content)
-    
-    except json.JSONDecodeError as e:
-        print(f"Failed to parse JSON response: {str(e)}")
-        print(f"Raw content: {content}")
-        # Fallback to manual parsing
-        return _manual_parse_response(content)
+        slides = _extract_slides_array(content)
+    if slides is not None:
+        return slides
+
+    print("Failed to parse JSON response")
+    print(f"Raw content: {content}")
+    # Fallback to manual parsing
+    return _manual_parse_response(content)
 
 def _manual_parse_response(content: str) -> List[Dict]:
     """Manually parse LLM response if JSON parsing fails"""
@@ -160,11 +540,11 @@ def _manual_parse_response(content: str) -> List[Dict]:
             title = line.strip('# *:').strip()
             current_slide = {"title": title, "points": []}
         
-        elif line.startswith(('-', '*', '•')) or line[0].isdigit() and line[1] in '.):':
+        elif line.startswith(('-', '*', '•')) or (len(line) > 1 and line[0].isdigit() and line[1] in '.):'):
             # This is a bullet point
             if current_slide:
-                point = re.sub(r'^[-*•]\s*', '', line)
-                point = re.sub(r'^\d+[.):]\s*', '', point)
+                point = _BULLET_RE.sub('', line)
+                point = _NUM_RE.sub('', point)
                 current_slide["points"].append(point.strip())
     
     # Add the last slide
@@ -180,23 +560,33 @@ def _manual_parse_response(content: str) -> List[Dict]:
     
     return slides
 
-def _fallback_text_analysis(text_content: str, guidance: str) -> List[Dict]:
-    """Fallback method to create slides without LLM"""
-    print("Using fallback text analysis...")
-    
-    # Simple text analysis approach
-    paragraphs = [p.strip() for p in text_content.split('\n\n') if p.strip()]
+def _iter_sentences(text: str):
+    """Yield stripped sentences, keeping their terminator ('.' if the text ends without one)"""
+    for m in _SENT_RE.finditer(text):
+        if m.group(1).strip():
+            sentence = m.group(0).strip()
+            yield sentence if sentence[-1] in '.!?' else sentence + '.'
+
+def _split_paragraphs(text_content: str) -> List[str]:
+    """Split text into paragraphs, grouping sentences in threes when there are no blank lines"""
+    paragraphs = [p.strip() for p in _PARA_RE.split(text_content) if p.strip()]
     
     if len(paragraphs) <= 1:
         # Split by sentences if no clear paragraphs
-        sentences = [s.strip() for s in text_content.split('.') if s.strip()]
+        sentences = list(_iter_sentences(text_content))
         paragraphs = []
-        current_para = ""
+        buf = []
         for i, sentence in enumerate(sentences):
-            current_para += sentence + ". "
+            buf.append(sentence)
             if (i + 1) % 3 == 0 or i == len(sentences) - 1:
-                paragraphs.append(current_para.strip())
-                current_para = ""
+                paragraphs.append(" ".join(buf))
+                buf.clear()
+    
+    return paragraphs
+
+def _fallback_text_analysis(text_content: str, guidance: str) -> List[Dict]:
+    """Fallback method to create slides without LLM"""
+    print("Using fallback text analysis...")
     
     slides = []
     
@@ -210,19 +600,28 @@ def _fallback_text_analysis(text_content: str, guidance: str) -> List[Dict]:
         "points": [f"Based on provided content", f"Generated automatically"]
     })
     
+    slides.extend(_fallback_content_slides(text_content))
+    
+    return slides
+
+def _fallback_content_slides(text_content: str, max_slides: int = 10) -> List[Dict]:
+    """One slide per paragraph of text_content, titled from its first sentence"""
+    paragraphs = _split_paragraphs(text_content)
+    
+    slides = []
+    
     # Create content slides
-    for i, para in enumerate(paragraphs[:10]):  # Limit to 10 content slides
+    for i, para in enumerate(paragraphs[:max_slides]):  # Limit to 10 content slides by default
         slide_title = f"Topic {i+1}"
         
+        # Split paragraph into points, scanning only as far as the first 5 sentences
+        points = list(islice(_iter_sentences(para), 5))  # Max 5 points per slide
+        
         # Try to extract a title from the first sentence
-        first_sentence = para.split('.')[0].strip()
+        first_sentence = points[0].rstrip('.!?') if points else para
         if len(first_sentence.split()) <= 8:
             slide_title = first_sentence
         
-        # Split paragraph into points
-        sentences = [s.strip() + '.' for s in para.split('.') if s.strip()]
-        points = sentences[:5]  # Max 5 points per slide
-        
         slides.append({
             "title": slide_title,
             "points": points
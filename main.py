@@ -3,14 +3,29 @@
 from fastapi import FastAPI, HTTPException, File, UploadFile, Form, BackgroundTasks
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+import hashlib
 import os
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+import aiofiles
+
+from core.cache import PptxFileCache, open_deck_cache
 from core.llm_handler import generate_slide_content
 from core.generator import create_ppt_from_template
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Dedicated pool for deck generation, so concurrent builds don't compete with
+# other to_thread work (lxml releases the GIL while parsing/serializing)
+_PPTX_EXEC = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Identical slide data + template produce an identical deck, so built files are reused
+deck_cache = open_deck_cache()
+
 app = FastAPI(title="Text to PowerPoint Generator")
 
 app.add_middleware(
@@ -26,6 +41,18 @@ def cleanup_directory(path: str):
     print(f"Cleaning up temporary directory: {path}")
     shutil.rmtree(path)
 
+def build_deck(slide_data, output_path, template_path, template_digest, deck_key):
+    """Create the PPT file at output_path, reusing a cached deck for identical input."""
+    if deck_cache is not None and deck_cache.get(deck_key, output_path):
+        return
+    create_ppt_from_template(slide_data, output_path, template_path, template_digest=template_digest or None)
+    if deck_cache is not None:
+        try:
+            deck_cache.put(deck_key, output_path)
+        except OSError as e:
+            # The deck itself is fine, only skip caching it
+            print(f"Deck cache write failed: {str(e)}")
+
 @app.post("/generate-ppt")
 async def generate_ppt(
     background_tasks: BackgroundTasks, # Add this dependency
@@ -41,13 +68,19 @@ async def generate_ppt(
     
     try:
         template_path = None
+        template_digest = ""
         if template_file:
             template_path = os.path.join(temp_dir, template_file.filename)
-            with open(template_path, "wb") as buffer:
-                shutil.copyfileobj(template_file.file, buffer)
+            template_hash = hashlib.sha256()
+            # Stream the upload in 1 MiB chunks instead of buffering it whole
+            async with aiofiles.open(template_path, "wb") as buffer:
+                while chunk := await template_file.read(UPLOAD_CHUNK_SIZE):
+                    template_hash.update(chunk)
+                    await buffer.write(chunk)
+            template_digest = template_hash.hexdigest()
         
         # 1. Generate structured slide content from LLM
-        slide_data = generate_slide_content(
+        slide_data = await generate_slide_content(
             text_content=text_content,
             guidance=guidance,
             llm_provider=llm_provider,
@@ -61,10 +94,17 @@ async def generate_ppt(
         safe_filename = f"{filename.replace(' ', '_')}.pptx"
         output_path = os.path.join(temp_dir, safe_filename)
         
-        create_ppt_from_template(
-            slide_data=slide_data,
-            output_path=output_path,
-            template_path=template_path
+        deck_key = PptxFileCache.make_key(slide_data, template_digest)
+        # Building (or copying a cached) deck is blocking work, keep it off the event loop.
+        # The deck is always served from temp_dir, so cache eviction can't remove it mid-response.
+        await asyncio.get_running_loop().run_in_executor(
+            _PPTX_EXEC,
+            build_deck,
+            slide_data,
+            output_path,
+            template_path,
+            template_digest,
+            deck_key
         )
         
         # 3. Add the cleanup task to run AFTER the response is sent